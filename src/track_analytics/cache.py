@@ -0,0 +1,91 @@
+"""On-disk cache for parsed tracks and computed metrics."""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+
+import platformdirs
+
+from . import __version__
+
+# Bump when the layout of cached objects changes, and whenever a change to
+# parsing or metric calculations alters the values they hold: cached
+# TrackMetrics are otherwise served until the GPX file itself changes
+CACHE_FORMAT = 4
+
+# Entries kept on disk; a track and its metrics are two entries
+MAX_CACHE_FILES = 64
+
+
+def cache_dir() -> Path:
+    """Directory holding cached pickles."""
+    return Path(platformdirs.user_cache_dir("track-analytics"))
+
+
+def file_key(file_path: Path) -> str:
+    """Cache key for a file, derived from its resolved path, mtime and size."""
+    stat = file_path.stat()
+    raw = f"{__version__}|{CACHE_FORMAT}|{file_path.resolve()}|{stat.st_mtime_ns}|{stat.st_size}"
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def load(key: str, kind: str) -> object | None:
+    """Load a cached object, or None if it is missing or unreadable."""
+    path = cache_dir() / f"{key}.{kind}.pkl"
+    try:
+        with open(path, "rb") as f:
+            obj = pickle.load(f)
+    except Exception:
+        # A missing, truncated or stale entry is just a cache miss
+        return None
+
+    # Mark the entry as recently used so pruning keeps it
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return obj
+
+
+def store(key: str, kind: str, obj: object) -> None:
+    """Store an object in the cache. Failures are ignored."""
+    path = cache_dir() / f"{key}.{kind}.pkl"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp file per writer, since the same key may be stored from
+        # several threads or processes at once
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    except OSError:
+        return
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(obj, f, protocol=5)
+        # Atomic rename so concurrent runs never see a partial file
+        os.replace(tmp_name, path)
+    except (OSError, pickle.PicklingError, TypeError, AttributeError):
+        # Unpicklable objects raise any of the last three
+        Path(tmp_name).unlink(missing_ok=True)
+        return
+
+    _prune(path.parent)
+
+
+def _prune(directory: Path) -> None:
+    """Delete the least recently used entries beyond MAX_CACHE_FILES.
+
+    Entries left behind by edited files, or by older cache formats and
+    versions, are never hit again and age out this way.
+    """
+    try:
+        entries = sorted(
+            ((p.stat().st_mtime_ns, p) for p in directory.glob("*.pkl")),
+            reverse=True,
+        )
+        for _, stale in entries[MAX_CACHE_FILES:]:
+            stale.unlink(missing_ok=True)
+    except OSError:
+        # Another run may be pruning the same directory
+        pass
@@ -2,11 +2,25 @@
 
 from pathlib import Path
 
-import matplotlib.pyplot as plt
+import matplotlib
 import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
 
 from .gpx_parser import Track
-from .metrics import cumulative_distances
+from .metrics import cumulative_distances, fill_speed_outliers
+
+CHART_DPI = 150
+
+# zlib level 3 encodes much faster than Pillow's default of 6, at the cost
+# of somewhat larger files
+PNG_COMPRESS_LEVEL = 3
+
+# Route simplification gives up after scanning this many times the number
+# of points, since a balanced search only needs about log2(kept) passes
+RDP_SCAN_FACTOR = 32
 
 
 def generate_comparison_charts(
@@ -32,7 +46,11 @@ def generate_comparison_charts(
     if has_timing:
         num_plots += 1
 
-    fig, axes = plt.subplots(num_plots, 1, figsize=(12, 4 * num_plots))
+    # A standalone Figure on an Agg canvas: charts are only ever written to
+    # files, so neither pyplot's figure registry nor a GUI backend is needed
+    fig = Figure(figsize=(12, 4 * num_plots))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(num_plots, 1)
     if num_plots == 1:
         axes = [axes]
 
@@ -54,20 +72,102 @@ def generate_comparison_charts(
         ax = axes[plot_idx]
         _plot_speed_profiles(ax, track1, track2)
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches="tight")
-    plt.close()
+    # Lay out once here instead of bbox_inches="tight", which renders the
+    # figure a second time just to measure it. The right margin is kept free
+    # for the legends, which sit outside the axes so they never hide data.
+    fig.tight_layout(rect=(0, 0, 0.85, 1))
 
+    # PNG encoder options are rejected by the vector backends
+    save_kwargs = {}
+    if output_path.suffix.lower() in ("", ".png"):
+        save_kwargs["pil_kwargs"] = {"compress_level": PNG_COMPRESS_LEVEL}
 
-def _plot_route_map(ax: plt.Axes, track1: Track, track2: Track) -> None:
-    """Plot route map with both tracks overlaid."""
-    lats1 = [p.latitude for p in track1.points]
-    lons1 = [p.longitude for p in track1.points]
-    lats2 = [p.latitude for p in track2.points]
-    lons2 = [p.longitude for p in track2.points]
+    # Draw long polylines in chunks rather than as one huge Agg path
+    with matplotlib.rc_context({"agg.path.chunksize": 10000}):
+        fig.savefig(output_path, dpi=CHART_DPI, **save_kwargs)
+
+
+def _simplify_polyline(x: np.ndarray, y: np.ndarray, epsilon: float, max_points: int) -> np.ndarray:
+    """Ramer-Douglas-Peucker simplification.
+
+    Returns a boolean mask of the points to keep: the endpoints plus every
+    point that lies further than epsilon from the simplified line.
+
+    Lines of at most max_points points are kept whole. Each split is a
+    Python-level step, and jagged lines can make every split scan nearly
+    the whole line, so the search also gives up and keeps every point once
+    it has kept more than max_points or scanned more than
+    RDP_SCAN_FACTOR times the line length.
+    """
+    n = len(x)
+    if n <= max_points:
+        return np.ones(n, dtype=bool)
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    kept = 2
+    scan_budget = RDP_SCAN_FACTOR * n
+
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+
+        scan_budget -= end - start - 1
+        if kept > max_points or scan_budget < 0:
+            return np.ones(n, dtype=bool)
+
+        # Perpendicular distance of the inner points from the start-end chord
+        dx = x[end] - x[start]
+        dy = y[end] - y[start]
+        px = x[start + 1 : end] - x[start]
+        py = y[start + 1 : end] - y[start]
+        chord = np.hypot(dx, dy)
+        if chord > 0:
+            dist = np.abs(dx * py - dy * px) / chord
+        else:
+            dist = np.hypot(px, py)
+
+        i = int(np.argmax(dist))
+        if dist[i] > epsilon:
+            split = start + 1 + i
+            keep[split] = True
+            kept += 1
+            stack.append((start, split))
+            stack.append((split, end))
+
+    return keep
 
-    ax.plot(lons1, lats1, "b-", linewidth=2, label=track1.name, alpha=0.7)
-    ax.plot(lons2, lats2, "r-", linewidth=2, label=track2.name, alpha=0.7)
+
+def _route_collection(track: Track, epsilon: float, max_points: int, color: str) -> LineCollection:
+    """Build a single-path line collection for a simplified track."""
+    keep = _simplify_polyline(track.lon, track.lat, epsilon, max_points)
+    vertices = np.column_stack([track.lon[keep], track.lat[keep]])
+    return LineCollection([vertices], colors=color, linewidths=2, alpha=0.7, label=track.name)
+
+
+def _plot_route_map(ax: Axes, track1: Track, track2: Track) -> None:
+    """Plot route map with both tracks overlaid."""
+    lats1, lons1 = track1.lat, track1.lon
+    lats2, lons2 = track2.lat, track2.lon
+
+    # Drop points that would move the line by less than half a pixel.
+    # With an equal aspect ratio the tighter of the two axes sets the scale.
+    fig = ax.get_figure()
+    bbox = ax.get_position()
+    width_px = bbox.width * fig.get_figwidth() * CHART_DPI
+    height_px = bbox.height * fig.get_figheight() * CHART_DPI
+    lon_span = max(lons1.max(), lons2.max()) - min(lons1.min(), lons2.min())
+    lat_span = max(lats1.max(), lats2.max()) - min(lats1.min(), lats2.min())
+    epsilon = 0.5 * max(lon_span / width_px, lat_span / height_px)
+    # Simplifying to more vertices than the axes have pixels around their
+    # edge costs more than drawing the whole line
+    max_points = int(2 * (width_px + height_px))
+
+    ax.add_collection(_route_collection(track1, epsilon, max_points, "b"))
+    ax.add_collection(_route_collection(track2, epsilon, max_points, "r"))
+    ax.autoscale_view()
 
     # Mark start and end points
     ax.plot(lons1[0], lats1[0], "go", markersize=10, label="Start (Track 1)")
@@ -78,83 +178,61 @@ def _plot_route_map(ax: plt.Axes, track1: Track, track2: Track) -> None:
     ax.set_xlabel("Longitude")
     ax.set_ylabel("Latitude")
     ax.set_title("Route Comparison")
-    ax.legend(loc="best")
+    ax.legend(loc="upper left", bbox_to_anchor=(1.0, 1.0))
     ax.set_aspect("equal")
     ax.grid(True, alpha=0.3)
 
 
-def _plot_elevation_profiles(ax: plt.Axes, track1: Track, track2: Track) -> None:
+def _plot_elevation_profiles(ax: Axes, track1: Track, track2: Track) -> None:
     """Plot elevation profiles for both tracks."""
     dist1 = cumulative_distances(track1)
-    elev1 = [p.elevation for p in track1.points]
+    elev1 = track1.elev
 
     dist2 = cumulative_distances(track2)
-    elev2 = [p.elevation for p in track2.points]
+    elev2 = track2.elev
 
     ax.plot(dist1, elev1, "b-", linewidth=1.5, label=track1.name, alpha=0.8)
     ax.plot(dist2, elev2, "r-", linewidth=1.5, label=track2.name, alpha=0.8)
 
-    ax.fill_between(dist1, elev1, alpha=0.2, color="blue")
-    ax.fill_between(dist2, elev2, alpha=0.2, color="red")
+    # The shading is background only: rasterize it in vector outputs and
+    # skip edge stroking and antialiasing, which dominate its draw time
+    fill_style = {"alpha": 0.2, "linewidth": 0, "antialiased": False, "rasterized": True}
+    ax.fill_between(dist1, elev1, color="blue", **fill_style)
+    ax.fill_between(dist2, elev2, color="red", **fill_style)
 
     ax.set_xlabel("Distance (km)")
     ax.set_ylabel("Elevation (m)")
     ax.set_title("Elevation Profiles")
-    ax.legend(loc="best")
+    ax.legend(loc="upper left", bbox_to_anchor=(1.0, 1.0))
     ax.grid(True, alpha=0.3)
 
 
-def _plot_speed_profiles(ax: plt.Axes, track1: Track, track2: Track) -> None:
+def _plot_speed_profiles(ax: Axes, track1: Track, track2: Track) -> None:
     """Plot speed profiles for both tracks."""
     speeds1, dist1 = _calculate_segment_speeds(track1)
     speeds2, dist2 = _calculate_segment_speeds(track2)
 
-    if speeds1:
+    if len(speeds1):
         ax.plot(dist1, speeds1, "b-", linewidth=1, label=track1.name, alpha=0.7)
-    if speeds2:
+    if len(speeds2):
         ax.plot(dist2, speeds2, "r-", linewidth=1, label=track2.name, alpha=0.7)
 
     ax.set_xlabel("Distance (km)")
     ax.set_ylabel("Speed (km/h)")
     ax.set_title("Speed Profiles")
-    ax.legend(loc="best")
+    ax.legend(loc="upper left", bbox_to_anchor=(1.0, 1.0))
     ax.grid(True, alpha=0.3)
     ax.set_ylim(bottom=0)
 
 
-def _calculate_segment_speeds(track: Track) -> tuple[list[float], list[float]]:
-    """Calculate speed for each segment of the track."""
-    from haversine import haversine, Unit
-
-    speeds = []
-    distances = [0.0]
-
-    timed_points = [(p, p.time) for p in track.points if p.time is not None]
-    if len(timed_points) < 2:
-        return [], []
-
-    for i in range(1, len(timed_points)):
-        p1, t1 = timed_points[i - 1]
-        p2, t2 = timed_points[i]
+def _calculate_segment_speeds(track: Track) -> tuple[np.ndarray, np.ndarray]:
+    """Calculate speed for each segment of the track.
 
-        segment_time = (t2 - t1).total_seconds()
-        if segment_time <= 0:
-            continue
-
-        segment_dist = haversine(
-            (p1.latitude, p1.longitude),
-            (p2.latitude, p2.longitude),
-            unit=Unit.KILOMETERS,
-        )
-
-        speed = (segment_dist / segment_time) * 3600  # km/h
-
-        # Filter unrealistic speeds
-        if speed > 200:
-            speed = speeds[-1] if speeds else 0
-
-        speeds.append(speed)
-        distances.append(distances[-1] + segment_dist)
+    Returns speeds (km/h) and the cumulative distance (km) at the end of
+    each segment, skipping segments without a positive duration.
+    """
+    kernels = track.kernels
+    keep = kernels.timed_segment_s > 0
+    speeds = fill_speed_outliers(kernels.timed_speed_kmh[keep])
 
-    # Remove first distance entry to match speeds length
-    return speeds, distances[1:]
+    return speeds, np.cumsum(kernels.timed_segment_km[keep])
@@ -2,6 +2,7 @@
 
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from .gpx_parser import parse_gpx
@@ -40,6 +41,11 @@ def main() -> int:
         action="store_true",
         help="Skip chart generation",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the parsed track and metrics cache",
+    )
     parser.add_argument(
         "--overlap-threshold",
         type=float,
@@ -57,13 +63,18 @@ def main() -> int:
         print(f"Error: File not found: {args.track2}", file=sys.stderr)
         return 1
 
-    # Parse tracks
-    try:
-        track1 = parse_gpx(args.track1)
-        track2 = parse_gpx(args.track2)
-    except Exception as e:
-        print(f"Error parsing GPX file: {e}", file=sys.stderr)
-        return 1
+    # The two tracks are independent, so parse them side by side. Only the
+    # file reads and lxml's C-level parsing drop the GIL, plus the haversine
+    # kernel when numba is installed; the per-element Python work does not.
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        future1 = executor.submit(parse_gpx, args.track1, use_cache=not args.no_cache)
+        future2 = executor.submit(parse_gpx, args.track2, use_cache=not args.no_cache)
+        try:
+            track1 = future1.result()
+            track2 = future2.result()
+        except Exception as e:
+            print(f"Error parsing GPX file: {e}", file=sys.stderr)
+            return 1
 
     # Calculate metrics
     metrics1 = calculate_metrics(track1)
@@ -0,0 +1,72 @@
+"""Vectorized geographic distance calculations."""
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is an optional speedup
+    njit = None
+
+# Mean Earth radius, matching the haversine package default
+EARTH_RADIUS_KM = 6371.0088
+
+
+def _haversine_rad(
+    lat1: np.ndarray,
+    lat2: np.ndarray,
+    dlat: np.ndarray,
+    dlon: np.ndarray,
+) -> np.ndarray:
+    """Haversine distance in kilometers from coordinates already in radians."""
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def haversine_km(
+    lat1: np.ndarray,
+    lon1: np.ndarray,
+    lat2: np.ndarray,
+    lon2: np.ndarray,
+) -> np.ndarray:
+    """Great-circle distance in kilometers between coordinates in degrees.
+
+    Inputs are broadcast against each other, so a single point can be
+    compared against a whole array of points.
+    """
+    lat1_r = np.radians(lat1)
+    lat2_r = np.radians(lat2)
+    dlat = lat2_r - lat1_r
+    dlon = np.radians(lon2) - np.radians(lon1)
+    return _haversine_rad(lat1_r, lat2_r, dlat, dlon)
+
+
+def _haversine_segments_loop(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Scalar haversine loop over consecutive points, compiled with numba."""
+    n = max(lat.size - 1, 0)
+    out = np.empty(n)
+    for i in range(n):
+        lat1 = math.radians(lat[i])
+        lat2 = math.radians(lat[i + 1])
+        dlat = lat2 - lat1
+        dlon = math.radians(lon[i + 1]) - math.radians(lon[i])
+        a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon / 2) ** 2
+        out[i] = 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+    return out
+
+
+_haversine_segments_jit = njit(cache=True, nogil=True)(_haversine_segments_loop) if njit is not None else None
+
+
+def haversine_segments_km(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Distance in kilometers of each consecutive segment of a polyline.
+
+    Returns an array of length N-1 for N input points.
+    """
+    if _haversine_segments_jit is not None:
+        return _haversine_segments_jit(lat, lon)
+
+    lat_r = np.radians(lat)
+    lon_r = np.radians(lon)
+    return _haversine_rad(lat_r[:-1], lat_r[1:], np.diff(lat_r), np.diff(lon_r))
@@ -1,11 +1,18 @@
 """GPX file parsing for OsmAnd tracks."""
 
-from dataclasses import dataclass
-from datetime import datetime
+import math
+import re
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import cached_property
 from pathlib import Path
 
-import gpxpy
-import gpxpy.gpx
+import numpy as np
+from lxml import etree
+
+from . import cache
+from .kernels import TrackKernels, compute_kernels
 
 
 @dataclass
@@ -18,60 +25,206 @@ class TrackPoint:
     time: datetime | None
 
 
-@dataclass
+@dataclass(eq=False)
 class Track:
-    """Parsed GPX track with all points."""
+    """Parsed GPX track.
+
+    Per-point values are stored as contiguous float64 arrays (lat, lon,
+    elev, time_s) for vectorized calculations. Missing elevations and
+    timestamps are NaN; time_s is in epoch seconds. Tracks compare by
+    identity, since array fields have no single truth value.
+    """
 
     name: str
-    points: list[TrackPoint]
     source_file: Path
+    lat: np.ndarray = field(repr=False)
+    lon: np.ndarray = field(repr=False)
+    elev: np.ndarray = field(repr=False)
+    time_s: np.ndarray = field(repr=False)
+    cache_key: str | None = field(default=None, repr=False)
+
+    @cached_property
+    def points(self) -> list[TrackPoint]:
+        """Track points as objects, built on first access."""
+        return [
+            TrackPoint(
+                latitude=lat,
+                longitude=lon,
+                elevation=None if math.isnan(elev) else elev,
+                time=None if math.isnan(t) else datetime.fromtimestamp(t, tz=timezone.utc),
+            )
+            for lat, lon, elev, t in zip(
+                self.lat.tolist(), self.lon.tolist(), self.elev.tolist(), self.time_s.tolist()
+            )
+        ]
+
+    @cached_property
+    def kernels(self) -> TrackKernels:
+        """Derived segment distance, timing and speed arrays."""
+        return compute_kernels(self.lat, self.lon, self.time_s)
+
+    @property
+    def point_count(self) -> int:
+        return len(self.lat)
 
     @property
     def has_elevation(self) -> bool:
-        return any(p.elevation is not None for p in self.points)
+        return bool(np.isfinite(self.elev).any())
 
     @property
     def has_timestamps(self) -> bool:
-        return any(p.time is not None for p in self.points)
-
-
-def parse_gpx(file_path: Path) -> Track:
-    """Parse a GPX file and return a Track object."""
-    with open(file_path, "r", encoding="utf-8") as f:
-        gpx = gpxpy.parse(f)
-
-    points: list[TrackPoint] = []
-    track_name = file_path.stem
-
-    for track in gpx.tracks:
-        if track.name:
-            track_name = track.name
-        for segment in track.segments:
-            for point in segment.points:
-                points.append(
-                    TrackPoint(
-                        latitude=point.latitude,
-                        longitude=point.longitude,
-                        elevation=point.elevation,
-                        time=point.time,
-                    )
-                )
-
-    # Also check for routes (some GPX files use routes instead of tracks)
-    for route in gpx.routes:
-        if route.name:
-            track_name = route.name
-        for point in route.points:
-            points.append(
-                TrackPoint(
-                    latitude=point.latitude,
-                    longitude=point.longitude,
-                    elevation=point.elevation,
-                    time=point.time,
-                )
-            )
+        return bool(np.isfinite(self.time_s).any())
+
+
+def parse_gpx(file_path: Path, use_cache: bool = True) -> Track:
+    """Parse a GPX file and return a Track object.
+
+    Parsed tracks are cached on disk keyed by the file's path, modification
+    time and size, so unchanged files are only parsed once.
+    """
+    if not use_cache:
+        return finalize(_parse_gpx_file(file_path))
+
+    key = cache.file_key(file_path)
+    track = cache.load(key, "track")
+    if isinstance(track, Track):
+        track.source_file = file_path
+        return track
+
+    track = finalize(_parse_gpx_file(file_path))
+    track.cache_key = key
+    cache.store(key, "track", track)
+    return track
+
+
+def finalize(track: Track) -> Track:
+    """Compute the track's derived arrays up front.
+
+    Done at parse time so the arrays are stored in the cache along with the
+    track, and every later consumer reads the same precomputed values.
+    Assigned directly rather than through the cached_property, whose lock
+    is shared by every Track before Python 3.12 and would serialize
+    tracks parsed in parallel threads.
+    """
+    track.kernels = compute_kernels(track.lat, track.lon, track.time_s)
+    return track
+
+
+def _localname(elem: etree._Element) -> str:
+    """Tag name without its XML namespace."""
+    return etree.QName(elem).localname
+
+
+def _parse_float(text: str | None) -> float:
+    """Parse a numeric element value, returning NaN if missing or invalid."""
+    if text is None:
+        return math.nan
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+
+# Date and time, optional fractional seconds, optional Z or +HH:MM/+HHMM offset
+_TIME_RE = re.compile(r"^(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2})(?:\.(\d+))?(Z|[+-]\d{2}:?\d{2})?$")
+
+
+def _parse_time(text: str | None) -> float:
+    """Parse an ISO 8601 timestamp to epoch seconds, or NaN if missing or invalid."""
+    if text is None:
+        return math.nan
+    # Python 3.10's fromisoformat only accepts isoformat() output, so
+    # normalize the fraction to 6 digits and the offset to +HH:MM first
+    match = _TIME_RE.match(text.strip())
+    if match is None:
+        return math.nan
+    base, fraction, offset = match.groups()
+    if fraction:
+        base += "." + fraction[:6].ljust(6, "0")
+    if offset == "Z":
+        base += "+00:00"
+    elif offset:
+        base += offset[:3] + ":" + offset[-2:]
+    try:
+        time = datetime.fromisoformat(base)
+    except ValueError:
+        return math.nan
+    # Timestamps without an offset are taken as UTC
+    if time.tzinfo is None:
+        time = time.replace(tzinfo=timezone.utc)
+    return time.timestamp()
+
+
+class _PointBuffer:
+    """Growable per-field buffers for points streamed from the XML."""
+
+    def __init__(self) -> None:
+        self.lat = array("d")
+        self.lon = array("d")
+        self.elev = array("d")
+        self.time_s = array("d")
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def append(self, elem: etree._Element) -> None:
+        self.lat.append(float(elem.get("lat")))
+        self.lon.append(float(elem.get("lon")))
+        self.elev.append(_parse_float(elem.findtext("{*}ele")))
+        self.time_s.append(_parse_time(elem.findtext("{*}time")))
+
+
+def _parse_gpx_file(file_path: Path) -> Track:
+    """Parse a GPX file without consulting the cache.
+
+    The file is streamed with lxml iterparse: only track/route points and
+    track/route names are handled, and processed elements are freed as we
+    go so memory stays flat for large files.
+
+    Route points are only used when the file has no track points (some GPX
+    files use routes instead of tracks).
+    """
+    track_points = _PointBuffer()
+    route_points = _PointBuffer()
+    track_name = None
+    route_name = None
+
+    events = etree.iterparse(str(file_path), events=("end",), tag=("{*}trkpt", "{*}rtept", "{*}name"))
+    for _, elem in events:
+        tag = _localname(elem)
+
+        if tag == "name":
+            parent = elem.getparent()
+            parent_tag = _localname(parent) if parent is not None else None
+            if elem.text and parent_tag == "trk":
+                track_name = elem.text
+            elif elem.text and parent_tag == "rte":
+                route_name = elem.text
+            continue
+
+        if tag == "trkpt":
+            track_points.append(elem)
+        elif not track_points:
+            route_points.append(elem)
+
+        # Free the point and any already processed siblings
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+    if track_points:
+        points, name = track_points, track_name
+    else:
+        points, name = route_points, route_name
 
     if not points:
         raise ValueError(f"No track points found in {file_path}")
 
-    return Track(name=track_name, points=points, source_file=file_path)
+    return Track(
+        name=name or file_path.stem,
+        source_file=file_path,
+        lat=np.frombuffer(points.lat, dtype=np.float64).copy(),
+        lon=np.frombuffer(points.lon, dtype=np.float64).copy(),
+        elev=np.frombuffer(points.elev, dtype=np.float64).copy(),
+        time_s=np.frombuffer(points.time_s, dtype=np.float64).copy(),
+    )
@@ -0,0 +1,66 @@
+"""Per-track array computations shared by metrics, overlap and charts."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .geo import haversine_segments_km
+
+
+@dataclass
+class TrackKernels:
+    """Derived per-segment arrays for a track, computed once.
+
+    The segment_* arrays follow the track's point order. The timed_* arrays
+    describe segments between consecutive timestamped points in time order,
+    which is what speed calculations use.
+    """
+
+    segment_km: np.ndarray
+    cumulative_km: np.ndarray
+    timed_segment_km: np.ndarray
+    timed_segment_s: np.ndarray
+    timed_speed_kmh: np.ndarray
+
+
+def _segment_speeds_kmh(distances_km: np.ndarray, durations_s: np.ndarray) -> np.ndarray:
+    """Speed of each segment in km/h, or 0 where the duration is not positive."""
+    speeds = np.zeros_like(distances_km)
+    np.divide(distances_km, durations_s, out=speeds, where=durations_s > 0)
+    return speeds * 3600
+
+
+def compute_kernels(lat: np.ndarray, lon: np.ndarray, time_s: np.ndarray) -> TrackKernels:
+    """Compute all derived arrays for a track with one haversine pass where possible."""
+    segment_km = haversine_segments_km(lat, lon)
+    cumulative_km = np.concatenate(([0.0], np.cumsum(segment_km)))
+
+    # Missing timestamps are NaN; skip the copies when every point has one
+    timed = np.isfinite(time_s)
+    all_timed = bool(timed.all())
+    if all_timed:
+        times, timed_lat, timed_lon = time_s, lat, lon
+    else:
+        times, timed_lat, timed_lon = time_s[timed], lat[timed], lon[timed]
+
+    # Sort by time. Recorded tracks are normally in order already, and a
+    # stable sort of ordered times is the identity, so check first.
+    in_order = not (times[1:] < times[:-1]).any()
+    if not in_order:
+        order = np.argsort(times, kind="stable")
+        times, timed_lat, timed_lon = times[order], timed_lat[order], timed_lon[order]
+
+    if all_timed and in_order:
+        # Same points in the same order as the track's own segments
+        timed_segment_km = segment_km
+    else:
+        timed_segment_km = haversine_segments_km(timed_lat, timed_lon)
+    timed_segment_s = np.diff(times)
+
+    return TrackKernels(
+        segment_km=segment_km,
+        cumulative_km=cumulative_km,
+        timed_segment_km=timed_segment_km,
+        timed_segment_s=timed_segment_s,
+        timed_speed_kmh=_segment_speeds_kmh(timed_segment_km, timed_segment_s),
+    )
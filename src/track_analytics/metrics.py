@@ -3,9 +3,17 @@
 from dataclasses import dataclass
 from datetime import timedelta
 
-from haversine import haversine, Unit
+import numpy as np
 
-from .gpx_parser import Track, TrackPoint
+from . import cache
+from .geo import njit
+from .gpx_parser import Track
+
+# Segments faster than this are treated as GPS errors
+MAX_REALISTIC_SPEED_KMH = 200.0
+
+# Below this speed the track is considered stopped
+MIN_MOVING_SPEED_KMH = 1.0
 
 
 @dataclass
@@ -44,132 +52,142 @@ class TrackMetrics:
     speed: SpeedMetrics | None
 
 
-def _point_distance_km(p1: TrackPoint, p2: TrackPoint) -> float:
-    """Calculate distance between two points in kilometers."""
-    return haversine((p1.latitude, p1.longitude), (p2.latitude, p2.longitude), unit=Unit.KILOMETERS)
-
-
 def calculate_total_distance(track: Track) -> float:
     """Calculate total track distance in kilometers."""
-    if len(track.points) < 2:
+    if track.point_count < 2:
         return 0.0
 
-    total = 0.0
-    for i in range(1, len(track.points)):
-        total += _point_distance_km(track.points[i - 1], track.points[i])
-    return total
-
+    return float(track.kernels.segment_km.sum())
 
-def calculate_elevation_metrics(track: Track) -> ElevationMetrics | None:
-    """Calculate elevation statistics."""
-    if not track.has_elevation:
-        return None
-
-    elevations = [p.elevation for p in track.points if p.elevation is not None]
-    if not elevations:
-        return None
 
+def _ascent_descent_loop(values, threshold: float) -> tuple[float, float]:
+    """Stateful ascent/descent loop shared by the numba and Python paths."""
     total_ascent = 0.0
     total_descent = 0.0
+    prev_elevation = values[0]
 
-    # Use a small threshold to filter GPS noise (2 meters)
-    threshold = 2.0
-    prev_elevation = elevations[0]
-
-    for elevation in elevations[1:]:
-        diff = elevation - prev_elevation
+    for i in range(1, len(values)):
+        diff = values[i] - prev_elevation
         if abs(diff) >= threshold:
             if diff > 0:
                 total_ascent += diff
             else:
-                total_descent += abs(diff)
-            prev_elevation = elevation
+                total_descent -= diff
+            prev_elevation = values[i]
+
+    return total_ascent, total_descent
+
+
+_ascent_descent_jit = njit(cache=True, nogil=True)(_ascent_descent_loop) if njit is not None else None
+
+
+def _ascent_descent(elevations: np.ndarray, threshold: float) -> tuple[float, float]:
+    """Sum elevation gain and loss, ignoring changes smaller than threshold.
+
+    The reference elevation only moves once a change reaches the threshold,
+    so slow steady climbs are still counted. This carry dependency is why
+    the loop cannot be expressed as a plain np.diff reduction.
+    """
+    if _ascent_descent_jit is not None:
+        return _ascent_descent_jit(elevations, threshold)
+
+    # Plain floats are much faster to iterate than numpy scalars
+    return _ascent_descent_loop(elevations.tolist(), threshold)
+
+
+def calculate_elevation_metrics(track: Track) -> ElevationMetrics | None:
+    """Calculate elevation statistics."""
+    # Missing elevations are NaN; skip the copy when every point has one
+    finite = np.isfinite(track.elev)
+    elevations = track.elev if finite.all() else track.elev[finite]
+    if elevations.size == 0:
+        return None
+
+    # Use a small threshold to filter GPS noise (2 meters)
+    total_ascent, total_descent = _ascent_descent(elevations, threshold=2.0)
 
     return ElevationMetrics(
-        min_elevation=min(elevations),
-        max_elevation=max(elevations),
+        min_elevation=float(elevations.min()),
+        max_elevation=float(elevations.max()),
         total_ascent=total_ascent,
         total_descent=total_descent,
     )
 
 
-def calculate_speed_metrics(track: Track) -> SpeedMetrics | None:
-    """Calculate speed and timing statistics."""
-    if not track.has_timestamps or len(track.points) < 2:
-        return None
+def fill_speed_outliers(speeds: np.ndarray) -> np.ndarray:
+    """Replace unrealistic speeds with the last realistic one (or 0 if none yet).
 
-    timed_points = [(p, p.time) for p in track.points if p.time is not None]
-    if len(timed_points) < 2:
-        return None
+    Done without branching by forward-filling the index of the last
+    realistic segment with np.maximum.accumulate.
+    """
+    unrealistic = speeds > MAX_REALISTIC_SPEED_KMH
+    last_good = np.where(unrealistic, -1, np.arange(len(speeds)))
+    np.maximum.accumulate(last_good, out=last_good)
+    return np.where(last_good >= 0, speeds[last_good], 0.0)
 
-    # Sort by time
-    timed_points.sort(key=lambda x: x[1])
 
-    start_time = timed_points[0][1]
-    end_time = timed_points[-1][1]
-    duration = end_time - start_time
+def calculate_speed_metrics(track: Track) -> SpeedMetrics | None:
+    """Calculate speed and timing statistics."""
+    kernels = track.kernels
+    # No timed segments means fewer than two timestamped points
+    if len(kernels.timed_segment_s) == 0:
+        return None
 
-    if duration.total_seconds() == 0:
+    duration_s = float(np.nanmax(track.time_s) - np.nanmin(track.time_s))
+    if duration_s == 0:
         return None
 
     total_distance = calculate_total_distance(track)
-    avg_speed = (total_distance / duration.total_seconds()) * 3600  # km/h
-
-    # Calculate max speed and moving time
-    max_speed = 0.0
-    moving_time = timedelta()
-    moving_distance = 0.0
-    min_moving_speed_kmh = 1.0  # Below 1 km/h is considered stopped
-
-    for i in range(1, len(timed_points)):
-        p1, t1 = timed_points[i - 1]
-        p2, t2 = timed_points[i]
+    avg_speed = (total_distance / duration_s) * 3600  # km/h
 
-        segment_time = (t2 - t1).total_seconds()
-        if segment_time <= 0:
-            continue
+    segment_time = kernels.timed_segment_s
+    segment_dist = kernels.timed_segment_km
+    segment_speed = kernels.timed_speed_kmh
 
-        segment_dist = _point_distance_km(p1, p2)
-        segment_speed = (segment_dist / segment_time) * 3600  # km/h
+    # Filter out zero-length intervals and unrealistic speeds (GPS errors)
+    valid = (segment_time > 0) & (segment_speed <= MAX_REALISTIC_SPEED_KMH)
+    max_speed = float(segment_speed[valid].max(initial=0.0))
 
-        # Filter out unrealistic speeds (GPS errors) - max 200 km/h
-        if segment_speed > 200:
-            continue
-
-        max_speed = max(max_speed, segment_speed)
-
-        if segment_speed >= min_moving_speed_kmh:
-            moving_time += t2 - t1
-            moving_distance += segment_dist
+    moving = valid & (segment_speed >= MIN_MOVING_SPEED_KMH)
+    moving_seconds = float(segment_time[moving].sum())
+    moving_distance = float(segment_dist[moving].sum())
 
     avg_moving_speed = 0.0
-    if moving_time.total_seconds() > 0:
-        avg_moving_speed = (moving_distance / moving_time.total_seconds()) * 3600
+    if moving_seconds > 0:
+        avg_moving_speed = (moving_distance / moving_seconds) * 3600
 
     return SpeedMetrics(
-        duration=duration,
+        duration=timedelta(seconds=duration_s),
         avg_speed_kmh=avg_speed,
         max_speed_kmh=max_speed,
-        moving_time=moving_time,
+        moving_time=timedelta(seconds=moving_seconds),
         avg_moving_speed_kmh=avg_moving_speed,
     )
 
 
 def calculate_metrics(track: Track) -> TrackMetrics:
-    """Calculate all metrics for a track."""
-    return TrackMetrics(
+    """Calculate all metrics for a track.
+
+    Results are cached on disk for tracks loaded through the parse cache.
+    """
+    if track.cache_key is not None:
+        metrics = cache.load(track.cache_key, "metrics")
+        if isinstance(metrics, TrackMetrics):
+            return metrics
+
+    metrics = TrackMetrics(
         track_name=track.name,
         total_distance_km=calculate_total_distance(track),
-        point_count=len(track.points),
+        point_count=track.point_count,
         elevation=calculate_elevation_metrics(track),
         speed=calculate_speed_metrics(track),
     )
 
+    if track.cache_key is not None:
+        cache.store(track.cache_key, "metrics", metrics)
+    return metrics
+
 
-def cumulative_distances(track: Track) -> list[float]:
+def cumulative_distances(track: Track) -> np.ndarray:
     """Get cumulative distance at each point (for plotting)."""
-    distances = [0.0]
-    for i in range(1, len(track.points)):
-        dist = _point_distance_km(track.points[i - 1], track.points[i])
-        distances.append(distances[-1] + dist)
-    return distances
+    return track.kernels.cumulative_km
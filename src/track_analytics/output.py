@@ -1,6 +1,9 @@
 """Text output formatting for track comparison."""
 
+from collections.abc import Callable
 from datetime import timedelta
+from operator import attrgetter
+from typing import Any
 
 from .metrics import TrackMetrics
 from .overlap import OverlapResult
@@ -24,150 +27,83 @@ def _format_row(label: str, val1: str, val2: str, diff: str = "") -> str:
     return f"  {label:<24} {val1:>14} {val2:>14} {diff:>14}"
 
 
-def format_metrics_comparison(metrics1: TrackMetrics, metrics2: TrackMetrics) -> str:
-    """Format a side-by-side comparison of two tracks."""
-    lines = []
+def _format_signed_duration(td: timedelta) -> str:
+    """Format a possibly negative timedelta with a leading minus sign."""
+    if td >= timedelta():
+        return _format_duration(td)
+    return f"-{_format_duration(-td)}"
 
-    # Header
-    lines.append("=" * 70)
-    lines.append("TRACK COMPARISON")
-    lines.append("=" * 70)
-    lines.append("")
 
-    # Track names
-    lines.append(f"Track 1: {metrics1.track_name}")
-    lines.append(f"Track 2: {metrics2.track_name}")
-    lines.append("")
+# Comparison table rows: (label, value getter, value formatter, difference formatter).
+# A difference formatter of None leaves the difference column empty.
+_Row = tuple[str, Callable[[Any], Any], Callable[[Any], str], Callable[[Any], str] | None]
 
-    # Column headers
-    lines.append(_format_row("Metric", "Track 1", "Track 2", "Difference"))
-    lines.append("-" * 70)
+_TRACK_ROWS: list[_Row] = [
+    ("Distance", attrgetter("total_distance_km"), "{:.2f} km".format, "{:+.2f} km".format),
+    ("Track points", attrgetter("point_count"), str, "{:+d}".format),
+]
+
+_ELEVATION_ROWS: list[_Row] = [
+    ("Min elevation", attrgetter("min_elevation"), "{:.0f} m".format, "{:+.0f} m".format),
+    ("Max elevation", attrgetter("max_elevation"), "{:.0f} m".format, "{:+.0f} m".format),
+    ("Total ascent", attrgetter("total_ascent"), "{:.0f} m".format, "{:+.0f} m".format),
+    ("Total descent", attrgetter("total_descent"), "{:.0f} m".format, "{:+.0f} m".format),
+]
+
+_SPEED_ROWS: list[_Row] = [
+    ("Duration", attrgetter("duration"), _format_duration, _format_signed_duration),
+    ("Moving time", attrgetter("moving_time"), _format_duration, None),
+    ("Avg speed", attrgetter("avg_speed_kmh"), "{:.1f} km/h".format, "{:+.1f} km/h".format),
+    ("Avg moving speed", attrgetter("avg_moving_speed_kmh"), "{:.1f} km/h".format, "{:+.1f} km/h".format),
+    ("Max speed", attrgetter("max_speed_kmh"), "{:.1f} km/h".format, "{:+.1f} km/h".format),
+]
 
-    # Distance
-    dist_diff = metrics1.total_distance_km - metrics2.total_distance_km
-    diff_str = f"{dist_diff:+.2f} km"
-    lines.append(
-        _format_row(
-            "Distance",
-            f"{metrics1.total_distance_km:.2f} km",
-            f"{metrics2.total_distance_km:.2f} km",
-            diff_str,
-        )
-    )
-
-    # Points
-    point_diff = metrics1.point_count - metrics2.point_count
-    lines.append(
-        _format_row(
-            "Track points",
-            str(metrics1.point_count),
-            str(metrics2.point_count),
-            f"{point_diff:+d}",
-        )
-    )
-
-    # Elevation metrics
-    if metrics1.elevation or metrics2.elevation:
-        lines.append("")
-        lines.append("ELEVATION")
-        lines.append("-" * 70)
-
-        e1 = metrics1.elevation
-        e2 = metrics2.elevation
-
-        if e1 and e2:
-            lines.append(
-                _format_row(
-                    "Min elevation",
-                    f"{e1.min_elevation:.0f} m",
-                    f"{e2.min_elevation:.0f} m",
-                    f"{e1.min_elevation - e2.min_elevation:+.0f} m",
-                )
-            )
-            lines.append(
-                _format_row(
-                    "Max elevation",
-                    f"{e1.max_elevation:.0f} m",
-                    f"{e2.max_elevation:.0f} m",
-                    f"{e1.max_elevation - e2.max_elevation:+.0f} m",
-                )
-            )
-            lines.append(
-                _format_row(
-                    "Total ascent",
-                    f"{e1.total_ascent:.0f} m",
-                    f"{e2.total_ascent:.0f} m",
-                    f"{e1.total_ascent - e2.total_ascent:+.0f} m",
-                )
-            )
-            lines.append(
-                _format_row(
-                    "Total descent",
-                    f"{e1.total_descent:.0f} m",
-                    f"{e2.total_descent:.0f} m",
-                    f"{e1.total_descent - e2.total_descent:+.0f} m",
-                )
-            )
-        else:
-            val1 = "available" if e1 else "N/A"
-            val2 = "available" if e2 else "N/A"
-            lines.append(_format_row("Elevation data", val1, val2))
-
-    # Speed/timing metrics
-    if metrics1.speed or metrics2.speed:
-        lines.append("")
-        lines.append("TIMING & SPEED")
-        lines.append("-" * 70)
-
-        s1 = metrics1.speed
-        s2 = metrics2.speed
-
-        if s1 and s2:
-            dur_diff = s1.duration - s2.duration
-            lines.append(
-                _format_row(
-                    "Duration",
-                    _format_duration(s1.duration),
-                    _format_duration(s2.duration),
-                    _format_duration(dur_diff) if dur_diff >= timedelta() else f"-{_format_duration(-dur_diff)}",
-                )
-            )
-            lines.append(
-                _format_row(
-                    "Moving time",
-                    _format_duration(s1.moving_time),
-                    _format_duration(s2.moving_time),
-                    "",
-                )
-            )
-            lines.append(
-                _format_row(
-                    "Avg speed",
-                    f"{s1.avg_speed_kmh:.1f} km/h",
-                    f"{s2.avg_speed_kmh:.1f} km/h",
-                    f"{s1.avg_speed_kmh - s2.avg_speed_kmh:+.1f} km/h",
-                )
-            )
-            lines.append(
-                _format_row(
-                    "Avg moving speed",
-                    f"{s1.avg_moving_speed_kmh:.1f} km/h",
-                    f"{s2.avg_moving_speed_kmh:.1f} km/h",
-                    f"{s1.avg_moving_speed_kmh - s2.avg_moving_speed_kmh:+.1f} km/h",
-                )
-            )
-            lines.append(
-                _format_row(
-                    "Max speed",
-                    f"{s1.max_speed_kmh:.1f} km/h",
-                    f"{s2.max_speed_kmh:.1f} km/h",
-                    f"{s1.max_speed_kmh - s2.max_speed_kmh:+.1f} km/h",
-                )
-            )
-        else:
-            val1 = "available" if s1 else "N/A"
-            val2 = "available" if s2 else "N/A"
-            lines.append(_format_row("Timing data", val1, val2))
+
+def _format_rows(rows: list[_Row], obj1: Any, obj2: Any) -> list[str]:
+    """Format comparison rows for two objects of the same type."""
+    lines = []
+    for label, getter, fmt, diff_fmt in rows:
+        val1 = getter(obj1)
+        val2 = getter(obj2)
+        diff = diff_fmt(val1 - val2) if diff_fmt else ""
+        lines.append(_format_row(label, fmt(val1), fmt(val2), diff))
+    return lines
+
+
+def _format_section(title: str, rows: list[_Row], obj1: Any, obj2: Any, data_label: str) -> list[str]:
+    """Format a titled section, or an availability row if either side lacks data."""
+    lines = ["", title, "-" * 70]
+    if obj1 and obj2:
+        lines.extend(_format_rows(rows, obj1, obj2))
+    else:
+        val1 = "available" if obj1 else "N/A"
+        val2 = "available" if obj2 else "N/A"
+        lines.append(_format_row(data_label, val1, val2))
+    return lines
+
+
+def format_metrics_comparison(metrics1: TrackMetrics, metrics2: TrackMetrics) -> str:
+    """Format a side-by-side comparison of two tracks."""
+    lines = [
+        "=" * 70,
+        "TRACK COMPARISON",
+        "=" * 70,
+        "",
+        f"Track 1: {metrics1.track_name}",
+        f"Track 2: {metrics2.track_name}",
+        "",
+        _format_row("Metric", "Track 1", "Track 2", "Difference"),
+        "-" * 70,
+    ]
+    lines.extend(_format_rows(_TRACK_ROWS, metrics1, metrics2))
+
+    e1, e2 = metrics1.elevation, metrics2.elevation
+    if e1 or e2:
+        lines.extend(_format_section("ELEVATION", _ELEVATION_ROWS, e1, e2, "Elevation data"))
+
+    s1, s2 = metrics1.speed, metrics2.speed
+    if s1 or s2:
+        lines.extend(_format_section("TIMING & SPEED", _SPEED_ROWS, s1, s2, "Timing data"))
 
     lines.append("")
     return "\n".join(lines)
@@ -1,10 +1,19 @@
 """Route overlap analysis between two tracks."""
 
+import math
 from dataclasses import dataclass
 
-from haversine import haversine, Unit
+import numpy as np
 
-from .gpx_parser import Track, TrackPoint
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy is an optional speedup
+    cKDTree = None
+
+from .geo import EARTH_RADIUS_KM, haversine_km
+from .gpx_parser import Track
+
+EARTH_RADIUS_M = EARTH_RADIUS_KM * 1000
 
 
 @dataclass
@@ -20,26 +29,61 @@ class OverlapResult:
     track2_unique_km: float
 
 
-def _find_nearest_point_distance(point: TrackPoint, track: Track) -> float:
-    """Find the minimum distance from a point to any point in a track."""
-    min_dist = float("inf")
-    for tp in track.points:
-        dist = haversine(
-            (point.latitude, point.longitude),
-            (tp.latitude, tp.longitude),
-            unit=Unit.METERS,
-        )
-        min_dist = min(min_dist, dist)
-    return min_dist
-
-
-def _segment_distance_km(p1: TrackPoint, p2: TrackPoint) -> float:
-    """Calculate distance between two points in kilometers."""
-    return haversine(
-        (p1.latitude, p1.longitude),
-        (p2.latitude, p2.longitude),
-        unit=Unit.KILOMETERS,
+def _project(lat: np.ndarray, lon: np.ndarray, ref_lat: float) -> np.ndarray:
+    """Project coordinates to a local equirectangular frame in meters.
+
+    Returns an (N, 2) array of x/y positions. Accurate enough for the short
+    distances used in overlap detection around the reference latitude.
+    """
+    x = EARTH_RADIUS_M * np.radians(lon) * np.cos(np.radians(ref_lat))
+    y = EARTH_RADIUS_M * np.radians(lat)
+    return np.column_stack([x, y])
+
+
+def _near_midpoints_kdtree(
+    track: Track,
+    other: Track,
+    threshold_meters: float,
+    ref_lat: float,
+) -> np.ndarray:
+    """Flag segments whose midpoint is near the other track, using a KD-tree."""
+    xy = _project(track.lat, track.lon, ref_lat)
+    other_tree = cKDTree(_project(other.lat, other.lon, ref_lat))
+
+    midpoints = 0.5 * (xy[:-1] + xy[1:])
+    # Points beyond the bound come back as inf, which lets the tree prune early
+    nearest, _ = other_tree.query(
+        midpoints,
+        k=1,
+        distance_upper_bound=np.nextafter(threshold_meters, np.inf),
     )
+    return nearest <= threshold_meters
+
+
+def _near_midpoints_bruteforce(track: Track, other: Track, threshold_meters: float) -> np.ndarray:
+    """Flag segments whose midpoint is near the other track, without scipy.
+
+    Each midpoint is compared against the other track's points, but only
+    candidates inside a lat/lon bounding box of the threshold get the
+    full haversine distance.
+    """
+    mid_lat = 0.5 * (track.lat[:-1] + track.lat[1:])
+    mid_lon = 0.5 * (track.lon[:-1] + track.lon[1:])
+    near = np.zeros(len(mid_lat), dtype=bool)
+
+    lat_bound = math.degrees(threshold_meters / EARTH_RADIUS_M)
+    for i, (lat, lon) in enumerate(zip(mid_lat.tolist(), mid_lon.tolist())):
+        # Degrees of longitude shrink with latitude; the 1% margin covers
+        # the curvature the flat bound ignores
+        lon_bound = 1.01 * lat_bound / max(math.cos(math.radians(lat)), 1e-9)
+        candidates = (np.abs(other.lat - lat) <= lat_bound) & (np.abs(other.lon - lon) <= lon_bound)
+        if not candidates.any():
+            continue
+
+        dist_m = haversine_km(lat, lon, other.lat[candidates], other.lon[candidates]) * 1000
+        near[i] = bool((dist_m <= threshold_meters).any())
+
+    return near
 
 
 def analyze_overlap(
@@ -61,40 +105,21 @@ def analyze_overlap(
     Returns:
         OverlapResult with overlap statistics
     """
-    # Calculate overlap for track1 (how much of track1 is near track2)
-    track1_total_km = 0.0
-    track1_overlap_km = 0.0
-
-    for i in range(1, len(track1.points)):
-        p1 = track1.points[i - 1]
-        p2 = track1.points[i]
-        segment_dist = _segment_distance_km(p1, p2)
-        track1_total_km += segment_dist
-
-        # Check midpoint of segment
-        mid_lat = (p1.latitude + p2.latitude) / 2
-        mid_lon = (p1.longitude + p2.longitude) / 2
-        mid_point = TrackPoint(mid_lat, mid_lon, None, None)
-
-        if _find_nearest_point_distance(mid_point, track2) <= threshold_meters:
-            track1_overlap_km += segment_dist
-
-    # Calculate overlap for track2 (how much of track2 is near track1)
-    track2_total_km = 0.0
-    track2_overlap_km = 0.0
-
-    for i in range(1, len(track2.points)):
-        p1 = track2.points[i - 1]
-        p2 = track2.points[i]
-        segment_dist = _segment_distance_km(p1, p2)
-        track2_total_km += segment_dist
-
-        mid_lat = (p1.latitude + p2.latitude) / 2
-        mid_lon = (p1.longitude + p2.longitude) / 2
-        mid_point = TrackPoint(mid_lat, mid_lon, None, None)
-
-        if _find_nearest_point_distance(mid_point, track1) <= threshold_meters:
-            track2_overlap_km += segment_dist
+    # How much of track1 is near track2, and vice versa
+    if cKDTree is not None:
+        # Project both tracks around a shared reference latitude so that
+        # Euclidean distances between them are comparable
+        ref_lat = float(track1.lat.mean())
+        near1 = _near_midpoints_kdtree(track1, track2, threshold_meters, ref_lat)
+        near2 = _near_midpoints_kdtree(track2, track1, threshold_meters, ref_lat)
+    else:
+        near1 = _near_midpoints_bruteforce(track1, track2, threshold_meters)
+        near2 = _near_midpoints_bruteforce(track2, track1, threshold_meters)
+
+    track1_total_km = float(track1.kernels.segment_km.sum())
+    track2_total_km = float(track2.kernels.segment_km.sum())
+    track1_overlap_km = float(track1.kernels.segment_km[near1].sum())
+    track2_overlap_km = float(track2.kernels.segment_km[near2].sum())
 
     # Calculate percentages
     track1_overlap_pct = (track1_overlap_km / track1_total_km * 100) if track1_total_km > 0 else 0.0
@@ -0,0 +1,106 @@
+"""Tests for the on-disk track and metrics cache."""
+
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+from track_analytics import cache
+from track_analytics.gpx_parser import parse_gpx
+
+GPX = """<gpx xmlns="http://www.topografix.com/GPX/1/1"><trk><name>{name}</name><trkseg>
+<trkpt lat="50.0" lon="14.0"/><trkpt lat="50.001" lon="14.0"/>
+</trkseg></trk></gpx>
+"""
+
+
+@pytest.fixture
+def cache_root(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    root = tmp_path / "cache"
+    monkeypatch.setattr(cache, "cache_dir", lambda: root)
+    return root
+
+
+def test_load_missing_entry_is_miss(cache_root: Path) -> None:
+    assert cache.load("0" * 32, "track") is None
+
+
+def test_store_then_load_hits(cache_root: Path) -> None:
+    cache.store("abc", "metrics", {"distance": 1.5})
+
+    assert cache.load("abc", "metrics") == {"distance": 1.5}
+    assert cache.load("abc", "track") is None
+
+
+@pytest.mark.parametrize("obj", [threading.Lock(), lambda: None])
+def test_store_ignores_unpicklable_objects(cache_root: Path, obj: object) -> None:
+    cache.store("abc", "track", obj)
+
+    assert cache.load("abc", "track") is None
+    assert list(cache_root.iterdir()) == []
+
+
+def test_corrupt_entry_is_miss(cache_root: Path) -> None:
+    cache_root.mkdir()
+    (cache_root / "abc.track.pkl").write_bytes(b"not a pickle")
+
+    assert cache.load("abc", "track") is None
+
+
+def test_file_key_changes_with_content(tmp_path: Path) -> None:
+    path = tmp_path / "ride.gpx"
+    path.write_text(GPX.format(name="Ride"), encoding="utf-8")
+    key = cache.file_key(path)
+
+    assert cache.file_key(path) == key
+    path.write_text(GPX.format(name="Longer ride"), encoding="utf-8")
+    assert cache.file_key(path) != key
+
+
+def test_parse_gpx_uses_cache(cache_root: Path, tmp_path: Path) -> None:
+    path = tmp_path / "ride.gpx"
+    path.write_text(GPX.format(name="Ride"), encoding="utf-8")
+
+    first = parse_gpx(path)
+    second = parse_gpx(path)
+
+    # The second call is unpickled from disk rather than reparsed
+    assert first.cache_key == second.cache_key
+    assert first is not second
+    assert second.name == "Ride"
+    assert second.kernels.segment_km.tolist() == first.kernels.segment_km.tolist()
+
+
+def test_parse_gpx_reparses_stale_and_corrupt_entries(cache_root: Path, tmp_path: Path) -> None:
+    path = tmp_path / "ride.gpx"
+    path.write_text(GPX.format(name="Ride"), encoding="utf-8")
+    parse_gpx(path)
+
+    # An edited file gets a new key and is parsed again
+    path.write_text(GPX.format(name="Evening ride"), encoding="utf-8")
+    track = parse_gpx(path)
+    assert track.name == "Evening ride"
+
+    # A corrupt entry is replaced by a fresh parse
+    entry = cache_root / f"{track.cache_key}.track.pkl"
+    entry.write_bytes(b"\x80\x05truncated")
+    assert parse_gpx(path).name == "Evening ride"
+    assert cache.load(track.cache_key, "track") is not None
+
+
+def test_store_prunes_least_recently_used(cache_root: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(cache, "MAX_CACHE_FILES", 3)
+    for i in range(3):
+        cache.store(f"key{i}", "track", i)
+        os.utime(cache_root / f"key{i}.track.pkl", ns=(i * 10**9, i * 10**9))
+
+    # Loading key0 makes it the most recently used entry
+    assert cache.load("key0", "track") == 0
+    cache.store("key3", "track", 3)
+
+    assert sorted(p.name for p in cache_root.glob("*.pkl")) == [
+        "key0.track.pkl",
+        "key2.track.pkl",
+        "key3.track.pkl",
+    ]
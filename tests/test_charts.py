@@ -0,0 +1,29 @@
+"""Tests for chart helpers."""
+
+import numpy as np
+
+from track_analytics.charts import _simplify_polyline
+
+
+def test_simplify_polyline_drops_collinear_points() -> None:
+    x = np.array([0.0, 1.0, 2.0, 3.0, 3.0, 3.0])
+    y = np.array([0.0, 0.0, 0.0, 0.0, 1.0, 2.0])
+
+    keep = _simplify_polyline(x, y, epsilon=0.1, max_points=4)
+
+    assert keep.tolist() == [True, False, False, True, False, True]
+
+
+def test_simplify_polyline_keeps_short_lines_whole() -> None:
+    x = np.arange(5.0)
+
+    assert _simplify_polyline(x, np.zeros(5), epsilon=0.1, max_points=5).all()
+
+
+def test_simplify_polyline_gives_up_on_jagged_lines() -> None:
+    # Every point of a zigzag is kept, so the search stops early and the
+    # whole line is drawn
+    x = np.arange(10_000.0)
+    y = (np.arange(10_000) % 2).astype(float)
+
+    assert _simplify_polyline(x, y, epsilon=0.1, max_points=100).all()
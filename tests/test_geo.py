@@ -0,0 +1,26 @@
+"""Tests for geographic distance kernels."""
+
+import numpy as np
+import pytest
+
+from track_analytics.geo import _haversine_segments_loop, haversine_segments_km
+
+
+def test_haversine_segments_km_known_distance() -> None:
+    # One degree of latitude along a meridian
+    assert haversine_segments_km(np.array([0.0, 1.0]), np.array([0.0, 0.0]))[0] == pytest.approx(111.195, abs=1e-3)
+
+
+def test_haversine_segments_loop_matches_numpy() -> None:
+    # The numba source loop only runs compiled when numba is installed, so
+    # check it directly against the numpy path
+    rng = np.random.default_rng(3)
+    lat = 50.0 + np.cumsum(rng.normal(scale=0.01, size=200))
+    lon = 14.0 + np.cumsum(rng.normal(scale=0.01, size=200))
+
+    np.testing.assert_allclose(_haversine_segments_loop(lat, lon), haversine_segments_km(lat, lon), rtol=1e-12)
+
+
+@pytest.mark.parametrize("size", [0, 1])
+def test_haversine_segments_without_segments(size: int) -> None:
+    assert _haversine_segments_loop(np.zeros(size), np.zeros(size)).size == 0
@@ -0,0 +1,102 @@
+"""Tests for GPX parsing."""
+
+import math
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from track_analytics.gpx_parser import _parse_time, parse_gpx
+
+GPX = """<?xml version="1.0" encoding="UTF-8"?>
+<gpx version="1.1" creator="OsmAnd" xmlns="http://www.topografix.com/GPX/1/1">
+  <rte><name>Route</name><rtept lat="10" lon="10"/></rte>
+  <trk>
+    <name>Morning Ride</name>
+    <trkseg>
+      <trkpt lat="50.0" lon="14.0"><ele>200.5</ele><time>2024-05-01T08:00:00Z</time></trkpt>
+      <trkpt lat="50.001" lon="14.0"><time>2024-05-01T08:00:10.5Z</time></trkpt>
+    </trkseg>
+    <trkseg>
+      <trkpt lat="50.002" lon="14.0"><ele>203</ele></trkpt>
+    </trkseg>
+  </trk>
+</gpx>
+"""
+
+
+def _epoch(*args: int, microsecond: int = 0) -> float:
+    return datetime(*args, microsecond=microsecond, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("2024-05-01T08:00:00Z", _epoch(2024, 5, 1, 8, 0, 0)),
+        ("2024-05-01T08:00:00", _epoch(2024, 5, 1, 8, 0, 0)),
+        ("2024-05-01T08:00:00.5Z", _epoch(2024, 5, 1, 8, 0, 0, microsecond=500000)),
+        ("2024-05-01T08:00:00.123Z", _epoch(2024, 5, 1, 8, 0, 0, microsecond=123000)),
+        ("2024-05-01T08:00:00.1234567Z", _epoch(2024, 5, 1, 8, 0, 0, microsecond=123456)),
+        ("2024-05-01T09:00:00+01:00", _epoch(2024, 5, 1, 8, 0, 0)),
+        ("2024-05-01T09:00:00+0100", _epoch(2024, 5, 1, 8, 0, 0)),
+        ("2024-05-01T07:30:00.25-0030", _epoch(2024, 5, 1, 8, 0, 0, microsecond=250000)),
+        (" 2024-05-01T08:00:00Z\n", _epoch(2024, 5, 1, 8, 0, 0)),
+    ],
+)
+def test_parse_time_formats(text: str, expected: float) -> None:
+    assert _parse_time(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", [None, "", "yesterday", "2024-13-01T08:00:00Z"])
+def test_parse_time_invalid_is_nan(text: str | None) -> None:
+    assert math.isnan(_parse_time(text))
+
+
+def test_parse_gpx_reads_track_points(tmp_path: Path) -> None:
+    path = tmp_path / "ride.gpx"
+    path.write_text(GPX, encoding="utf-8")
+
+    track = parse_gpx(path, use_cache=False)
+
+    # Track points win over route points, and so does the track name
+    assert track.name == "Morning Ride"
+    assert track.point_count == 3
+    assert track.lat.tolist() == [50.0, 50.001, 50.002]
+    assert track.elev[0] == 200.5 and math.isnan(track.elev[1])
+    assert track.time_s[1] - track.time_s[0] == pytest.approx(10.5)
+    assert math.isnan(track.time_s[2])
+    assert track.points[1].time == datetime(2024, 5, 1, 8, 0, 10, 500000, tzinfo=timezone.utc)
+    assert track.points[2].elevation == 203.0
+
+
+def test_parse_gpx_falls_back_to_route_points(tmp_path: Path) -> None:
+    path = tmp_path / "route.gpx"
+    path.write_text(
+        '<gpx xmlns="http://www.topografix.com/GPX/1/1"><rte><name>Loop</name>'
+        '<rtept lat="1" lon="2"/><rtept lat="1.5" lon="2"/></rte></gpx>',
+        encoding="utf-8",
+    )
+
+    track = parse_gpx(path, use_cache=False)
+
+    assert track.name == "Loop"
+    assert track.lat.tolist() == [1.0, 1.5]
+
+
+def test_parse_gpx_without_points_raises(tmp_path: Path) -> None:
+    path = tmp_path / "empty.gpx"
+    path.write_text('<gpx xmlns="http://www.topografix.com/GPX/1/1"></gpx>', encoding="utf-8")
+
+    with pytest.raises(ValueError, match="No track points"):
+        parse_gpx(path, use_cache=False)
+
+
+def test_parsed_tracks_compare_by_identity(tmp_path: Path) -> None:
+    path = tmp_path / "ride.gpx"
+    path.write_text(GPX, encoding="utf-8")
+
+    track1 = parse_gpx(path, use_cache=False)
+    track2 = parse_gpx(path, use_cache=False)
+
+    assert track1 == track1
+    assert track1 != track2
@@ -0,0 +1,52 @@
+"""Tests for the per-track kernel arrays."""
+
+import numpy as np
+import pytest
+
+from track_analytics.geo import haversine_segments_km
+from track_analytics.kernels import compute_kernels
+
+LAT = np.array([50.0, 50.001, 50.003, 50.004, 50.006])
+LON = np.array([14.0, 14.002, 14.001, 14.004, 14.005])
+
+
+def test_in_order_timestamps_share_segment_distances() -> None:
+    time_s = np.array([0.0, 10.0, 20.0, 40.0, 60.0])
+
+    kernels = compute_kernels(LAT, LON, time_s)
+
+    segment_km = haversine_segments_km(LAT, LON)
+    np.testing.assert_allclose(kernels.segment_km, segment_km)
+    np.testing.assert_allclose(kernels.cumulative_km, np.concatenate(([0.0], np.cumsum(segment_km))))
+    assert kernels.timed_segment_km is kernels.segment_km
+    assert kernels.timed_segment_s.tolist() == [10.0, 10.0, 20.0, 20.0]
+    np.testing.assert_allclose(kernels.timed_speed_kmh, segment_km / kernels.timed_segment_s * 3600)
+
+
+def test_out_of_order_and_missing_timestamps() -> None:
+    # Point 1 has no time, and points 3 and 4 were recorded in reverse
+    time_s = np.array([0.0, np.nan, 20.0, 60.0, 40.0])
+
+    kernels = compute_kernels(LAT, LON, time_s)
+
+    # Distances along the track keep the recorded point order
+    np.testing.assert_allclose(kernels.segment_km, haversine_segments_km(LAT, LON))
+
+    # Timed segments follow the timestamped points in time order: 0, 2, 4, 3
+    order = [0, 2, 4, 3]
+    timed_km = haversine_segments_km(LAT[order], LON[order])
+    np.testing.assert_allclose(kernels.timed_segment_km, timed_km)
+    assert kernels.timed_segment_s.tolist() == [20.0, 20.0, 20.0]
+    np.testing.assert_allclose(kernels.timed_speed_kmh, timed_km / 20.0 * 3600)
+
+
+def test_zero_and_missing_durations_have_zero_speed() -> None:
+    time_s = np.array([0.0, 0.0, np.nan, np.nan, 30.0])
+
+    kernels = compute_kernels(LAT, LON, time_s)
+
+    assert kernels.timed_segment_s.tolist() == [0.0, 30.0]
+    assert kernels.timed_speed_kmh[0] == 0.0
+    assert kernels.timed_speed_kmh[1] == pytest.approx(
+        haversine_segments_km(LAT[[1, 4]], LON[[1, 4]])[0] / 30.0 * 3600
+    )
@@ -0,0 +1,150 @@
+"""Tests for track metric calculations."""
+
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from track_analytics.geo import haversine_segments_km
+from track_analytics.gpx_parser import Track
+from track_analytics.metrics import (
+    MAX_REALISTIC_SPEED_KMH,
+    _ascent_descent,
+    _ascent_descent_loop,
+    calculate_elevation_metrics,
+    calculate_speed_metrics,
+    fill_speed_outliers,
+)
+
+FAST = MAX_REALISTIC_SPEED_KMH + 1
+
+
+def _track(lat: list[float], time_s: list[float], elev: list[float] | None = None) -> Track:
+    lat_arr = np.array(lat)
+    return Track(
+        name="test",
+        source_file=Path("test.gpx"),
+        lat=lat_arr,
+        lon=np.full(len(lat_arr), 14.0),
+        elev=np.array(elev) if elev is not None else np.full(len(lat_arr), np.nan),
+        time_s=np.array(time_s),
+    )
+
+
+def _km(lat1: float, lat2: float) -> float:
+    return float(haversine_segments_km(np.array([lat1, lat2]), np.array([14.0, 14.0]))[0])
+
+
+def test_elevation_counts_gradual_climbs() -> None:
+    # Every step is below the 2 m threshold, but the climb still counts
+    elev = [100.0 + i for i in range(11)] + [109.5, 109.0, 108.0]
+    track = _track([50.0] * len(elev), [np.nan] * len(elev), elev)
+
+    elevation = calculate_elevation_metrics(track)
+
+    assert elevation.total_ascent == 10.0
+    assert elevation.total_descent == 2.0
+    assert (elevation.min_elevation, elevation.max_elevation) == (100.0, 110.0)
+
+
+def test_elevation_skips_missing_values() -> None:
+    track = _track([50.0] * 5, [np.nan] * 5, [100.0, np.nan, 105.0, np.nan, 101.0])
+
+    elevation = calculate_elevation_metrics(track)
+
+    assert elevation.total_ascent == 5.0
+    assert elevation.total_descent == 4.0
+    assert (elevation.min_elevation, elevation.max_elevation) == (100.0, 105.0)
+
+
+def test_elevation_without_data_is_none() -> None:
+    assert calculate_elevation_metrics(_track([50.0] * 3, [np.nan] * 3)) is None
+
+
+def test_ascent_descent_loop_matches_dispatch() -> None:
+    # The numba path passes the ndarray straight to the loop, the Python
+    # path a list; both must agree
+    rng = np.random.default_rng(5)
+    elevations = 300.0 + np.cumsum(rng.normal(scale=1.5, size=500))
+
+    expected = _ascent_descent(elevations, threshold=2.0)
+    assert _ascent_descent_loop(elevations, 2.0) == pytest.approx(expected)
+    assert _ascent_descent_loop(elevations.tolist(), 2.0) == pytest.approx(expected)
+
+
+def test_fill_speed_outliers_keeps_realistic_speeds() -> None:
+    speeds = np.array([10.0, 0.0, MAX_REALISTIC_SPEED_KMH])
+
+    assert fill_speed_outliers(speeds).tolist() == [10.0, 0.0, MAX_REALISTIC_SPEED_KMH]
+
+
+def test_fill_speed_outliers_leading_outlier_is_zero() -> None:
+    speeds = np.array([FAST, FAST, 12.0, 15.0])
+
+    assert fill_speed_outliers(speeds).tolist() == [0.0, 0.0, 12.0, 15.0]
+
+
+def test_fill_speed_outliers_uses_last_realistic_speed() -> None:
+    speeds = np.array([12.0, FAST, FAST, 20.0, FAST])
+
+    assert fill_speed_outliers(speeds).tolist() == [12.0, 12.0, 12.0, 20.0, 20.0]
+
+
+def test_fill_speed_outliers_empty() -> None:
+    assert fill_speed_outliers(np.array([])).size == 0
+
+
+def test_speed_metrics_out_of_order_and_missing_timestamps() -> None:
+    # Point 1 has no time, and points 2 and 3 were recorded in reverse
+    track = _track([50.0, 50.001, 50.002, 50.003], [0.0, np.nan, 100.0, 50.0])
+
+    speed = calculate_speed_metrics(track)
+
+    # Timed segments run 0 -> 3 -> 2, each 50 s long
+    speeds = [_km(50.0, 50.003) / 50 * 3600, _km(50.003, 50.002) / 50 * 3600]
+    assert speed.duration == timedelta(seconds=100)
+    assert speed.avg_speed_kmh == pytest.approx(_km(50.0, 50.003) / 100 * 3600)
+    assert speed.max_speed_kmh == pytest.approx(max(speeds))
+    assert speed.moving_time == timedelta(seconds=100)
+    assert speed.avg_moving_speed_kmh == pytest.approx(sum(speeds) / 2)
+
+
+def test_speed_metrics_skip_zero_duration_segments() -> None:
+    track = _track([50.0, 50.001, 50.002], [0.0, 0.0, 60.0])
+
+    speed = calculate_speed_metrics(track)
+
+    assert speed.max_speed_kmh == pytest.approx(_km(50.001, 50.002) / 60 * 3600)
+    assert speed.moving_time == timedelta(seconds=60)
+
+
+def test_speed_metrics_drop_unrealistic_segments() -> None:
+    # The first segment covers ~111 m in one second (~400 km/h)
+    track = _track([50.0, 50.001, 50.002], [0.0, 1.0, 61.0])
+
+    speed = calculate_speed_metrics(track)
+
+    # Dropped rather than filled with a neighbouring speed as in the chart
+    assert speed.max_speed_kmh == pytest.approx(_km(50.001, 50.002) / 60 * 3600)
+    assert speed.moving_time == timedelta(seconds=60)
+    assert speed.avg_moving_speed_kmh == pytest.approx(speed.max_speed_kmh)
+
+
+def test_speed_metrics_moving_cutoff() -> None:
+    # The second segment covers ~1 m in a minute, well under 1 km/h
+    track = _track([50.0, 50.001, 50.00101], [0.0, 60.0, 120.0])
+
+    speed = calculate_speed_metrics(track)
+
+    assert speed.moving_time == timedelta(seconds=60)
+    assert speed.avg_moving_speed_kmh == pytest.approx(_km(50.0, 50.001) / 60 * 3600)
+    assert speed.duration == timedelta(seconds=120)
+
+
+@pytest.mark.parametrize(
+    "time_s",
+    [[30.0, 30.0, 30.0], [30.0, np.nan, np.nan], [np.nan, np.nan, np.nan]],
+)
+def test_speed_metrics_without_duration_is_none(time_s: list[float]) -> None:
+    assert calculate_speed_metrics(_track([50.0, 50.001, 50.002], time_s)) is None
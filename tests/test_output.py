@@ -0,0 +1,101 @@
+"""Tests for text output formatting."""
+
+from datetime import timedelta
+
+from track_analytics.metrics import ElevationMetrics, SpeedMetrics, TrackMetrics
+from track_analytics.output import format_metrics_comparison
+
+ELEVATION1 = ElevationMetrics(min_elevation=201.4, max_elevation=455.6, total_ascent=612.2, total_descent=598.7)
+ELEVATION2 = ElevationMetrics(min_elevation=198.0, max_elevation=470.2, total_ascent=640.0, total_descent=640.5)
+SPEED1 = SpeedMetrics(
+    duration=timedelta(hours=2, minutes=5, seconds=7),
+    avg_speed_kmh=21.34,
+    max_speed_kmh=54.26,
+    moving_time=timedelta(hours=1, minutes=52, seconds=30),
+    avg_moving_speed_kmh=23.71,
+)
+SPEED2 = SpeedMetrics(
+    duration=timedelta(hours=2, minutes=15, seconds=40),
+    avg_speed_kmh=19.87,
+    max_speed_kmh=61.03,
+    moving_time=timedelta(minutes=58, seconds=4),
+    avg_moving_speed_kmh=24.95,
+)
+
+# Expected lines are spelled out because several rows end in padding
+HEADER = [
+    "======================================================================",
+    "TRACK COMPARISON",
+    "======================================================================",
+    "",
+    "Track 1: Morning Ride",
+    "Track 2: Evening Ride",
+    "",
+    "  Metric                          Track 1        Track 2     Difference",
+    "----------------------------------------------------------------------",
+]
+
+BOTH_SECTIONS = HEADER + [
+    "  Distance                       44.51 km       45.03 km       -0.52 km",
+    "  Track points                       4123           4388           -265",
+    "",
+    "ELEVATION",
+    "----------------------------------------------------------------------",
+    "  Min elevation                     201 m          198 m           +3 m",
+    "  Max elevation                     456 m          470 m          -15 m",
+    "  Total ascent                      612 m          640 m          -28 m",
+    "  Total descent                     599 m          640 m          -42 m",
+    "",
+    "TIMING & SPEED",
+    "----------------------------------------------------------------------",
+    "  Duration                     2h 05m 07s     2h 15m 40s       -10m 33s",
+    "  Moving time                  1h 52m 30s        58m 04s               ",
+    "  Avg speed                     21.3 km/h      19.9 km/h      +1.5 km/h",
+    "  Avg moving speed              23.7 km/h      24.9 km/h      -1.2 km/h",
+    "  Max speed                     54.3 km/h      61.0 km/h      -6.8 km/h",
+    "",
+]
+
+MISSING_SECTIONS = HEADER + [
+    "  Distance                       44.51 km       45.03 km       -0.52 km",
+    "  Track points                       4123           4388           -265",
+    "",
+    "ELEVATION",
+    "----------------------------------------------------------------------",
+    "  Elevation data                available            N/A               ",
+    "",
+    "TIMING & SPEED",
+    "----------------------------------------------------------------------",
+    "  Timing data                         N/A      available               ",
+    "",
+]
+
+
+def _metrics(
+    name: str,
+    distance: float,
+    points: int,
+    elevation: ElevationMetrics | None,
+    speed: SpeedMetrics | None,
+) -> TrackMetrics:
+    return TrackMetrics(
+        track_name=name,
+        total_distance_km=distance,
+        point_count=points,
+        elevation=elevation,
+        speed=speed,
+    )
+
+
+def test_format_metrics_comparison_all_sections() -> None:
+    metrics1 = _metrics("Morning Ride", 44.512, 4123, ELEVATION1, SPEED1)
+    metrics2 = _metrics("Evening Ride", 45.03, 4388, ELEVATION2, SPEED2)
+
+    assert format_metrics_comparison(metrics1, metrics2) == "\n".join(BOTH_SECTIONS)
+
+
+def test_format_metrics_comparison_one_side_missing() -> None:
+    metrics1 = _metrics("Morning Ride", 44.512, 4123, ELEVATION1, None)
+    metrics2 = _metrics("Evening Ride", 45.03, 4388, None, SPEED2)
+
+    assert format_metrics_comparison(metrics1, metrics2) == "\n".join(MISSING_SECTIONS)
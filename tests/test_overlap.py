@@ -0,0 +1,68 @@
+"""Tests for route overlap analysis."""
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from track_analytics import overlap
+from track_analytics.geo import haversine_km
+from track_analytics.gpx_parser import Track
+
+requires_scipy = pytest.mark.skipif(overlap.cKDTree is None, reason="scipy is not installed")
+
+
+def _track(name: str, lat: np.ndarray, lon: np.ndarray) -> Track:
+    nan = np.full(len(lat), np.nan)
+    return Track(name=name, source_file=Path(f"{name}.gpx"), lat=lat, lon=lon, elev=nan, time_s=nan)
+
+
+@pytest.fixture
+def tracks() -> tuple[Track, Track]:
+    rng = np.random.default_rng(7)
+    # A ~10 km wandering route, and a second ride that follows its first
+    # half with GPS noise before heading off on its own
+    steps = rng.normal(scale=0.0005, size=(400, 2)) + [0.0002, 0.0001]
+    lat1, lon1 = (np.array([50.0, 14.0]) + np.cumsum(steps, axis=0)).T
+    lat2 = np.concatenate([lat1[:200], lat1[199] + np.linspace(0, 0.02, 150)])
+    lon2 = np.concatenate([lon1[:200], lon1[199] - np.linspace(0, 0.02, 150)])
+    lat2 = lat2 + rng.normal(scale=0.0002, size=len(lat2))
+    lon2 = lon2 + rng.normal(scale=0.0002, size=len(lon2))
+    return _track("one", lat1, lon1), _track("two", lat2, lon2)
+
+
+def test_bruteforce_matches_exact_nearest_point(tracks: tuple[Track, Track]) -> None:
+    track1, track2 = tracks
+
+    for threshold in (10.0, 50.0, 200.0):
+        for track, other in ((track1, track2), (track2, track1)):
+            mid_lat = 0.5 * (track.lat[:-1] + track.lat[1:])
+            mid_lon = 0.5 * (track.lon[:-1] + track.lon[1:])
+            dist_m = haversine_km(mid_lat[:, None], mid_lon[:, None], other.lat, other.lon) * 1000
+            expected = dist_m.min(axis=1) <= threshold
+
+            bruteforce = overlap._near_midpoints_bruteforce(track, other, threshold)
+            assert 0 < expected.sum() < len(expected)
+            np.testing.assert_array_equal(bruteforce, expected)
+
+
+@requires_scipy
+def test_bruteforce_matches_kdtree(tracks: tuple[Track, Track]) -> None:
+    track1, track2 = tracks
+    ref_lat = float(track1.lat.mean())
+
+    for threshold in (10.0, 50.0, 200.0):
+        for track, other in ((track1, track2), (track2, track1)):
+            kdtree = overlap._near_midpoints_kdtree(track, other, threshold, ref_lat)
+            bruteforce = overlap._near_midpoints_bruteforce(track, other, threshold)
+            assert 0 < kdtree.sum() < len(kdtree)
+            np.testing.assert_array_equal(bruteforce, kdtree)
+
+
+@requires_scipy
+def test_analyze_overlap_without_scipy(tracks: tuple[Track, Track], monkeypatch: pytest.MonkeyPatch) -> None:
+    track1, track2 = tracks
+    expected = overlap.analyze_overlap(track1, track2)
+
+    monkeypatch.setattr(overlap, "cKDTree", None)
+    assert overlap.analyze_overlap(track1, track2) == expected